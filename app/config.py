@@ -23,6 +23,8 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = f"sqlite:///{BASE_DIR / 'data' / 'replexon.db'}"
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
 
     # Backup paths (server-side)
     backup_log_path: str = "/var/log/plex-backup.log"
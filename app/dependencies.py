@@ -1,13 +1,57 @@
 """FastAPI dependency functions for database sessions and authentication."""
 
-from typing import Generator, Optional
+import time
+from datetime import datetime, timezone
+from typing import Dict, Generator, Optional, Tuple
 
 from fastapi import Cookie, Depends, HTTPException, Request, status
-from sqlalchemy.orm import Session as DBSession
+from sqlalchemy.orm import Session as DBSession, joinedload, make_transient_to_detached
 
 from app.database import SessionLocal
 from app.models.user import Session, User
 
+# Validated sessions cached briefly so the dashboard's polling UI doesn't
+# hit the DB on every request. Maps token -> (cached_at, session expiry,
+# snapshot of the user's column values).
+_session_cache: Dict[str, Tuple[float, datetime, dict]] = {}
+_SESSION_CACHE_TTL = 60
+_SESSION_CACHE_MAX = 4096
+
+_USER_COLUMNS = (
+    "id", "username", "email", "password_hash",
+    "is_admin", "created_at", "updated_at",
+)
+
+
+def invalidate_session_cache(session_token: str) -> None:
+    """Drop a cached session, e.g. after logout."""
+    _session_cache.pop(session_token, None)
+
+
+def _session_cache_get(session_token: str) -> Optional[dict]:
+    """Return cached user fields for a token, or None on miss/expiry."""
+    entry = _session_cache.get(session_token)
+    if entry is None:
+        return None
+    cached_at, expires_at, fields = entry
+    if time.monotonic() - cached_at > _SESSION_CACHE_TTL:
+        del _session_cache[session_token]
+        return None
+    now = datetime.now(timezone.utc)
+    if expires_at.tzinfo is None:
+        now = now.replace(tzinfo=None)
+    if now > expires_at:
+        del _session_cache[session_token]
+        return None
+    return fields
+
+
+def _session_cache_put(session_token: str, session: Session) -> None:
+    if len(_session_cache) >= _SESSION_CACHE_MAX:
+        _session_cache.clear()
+    fields = {col: getattr(session.user, col) for col in _USER_COLUMNS}
+    _session_cache[session_token] = (time.monotonic(), session.expires_at, fields)
+
 
 def get_db() -> Generator[DBSession, None, None]:
     """Yield a database session, closing it when done."""
@@ -30,19 +74,31 @@ def get_current_user(
             headers={"Location": "/login"},
         )
 
+    # Cache hit: rebuild the user and attach it to this request's session
+    # without emitting a SELECT. merge(load=False) keeps mutations (e.g.
+    # password change) tracked as usual.
+    cached = _session_cache_get(session_token)
+    if cached is not None:
+        user = User(**cached)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    # Eager-load the user so validating a session is one round-trip
+    # instead of a lazy-load SELECT per authenticated request.
     session = (
         db.query(Session)
+        .options(joinedload(Session.user))
         .filter(Session.id == session_token)
         .first()
     )
 
+    # Expired rows are swept by the background poller; deleting them here
+    # would turn the auth failure path into a write + fsync per request.
     if not session or session.is_expired:
-        if session:
-            db.delete(session)
-            db.commit()
         raise HTTPException(
             status_code=status.HTTP_303_SEE_OTHER,
             headers={"Location": "/login"},
         )
 
+    _session_cache_put(session_token, session)
     return session.user
@@ -1,17 +1,42 @@
 """FastAPI application factory with middleware and lifespan."""
 
 import asyncio
+import fcntl
 import logging
+import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 
 from app.config import settings
-from app.database import Base, SessionLocal, engine
+from app.database import Base, SessionLocal, engine, ensure_schema
+from app.templating import templates
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that sets Cache-Control headers.
+
+    Versioned requests (?v=<rev> from the static_url filter) are
+    immutable for a year; unversioned ones revalidate after a minute.
+    """
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        scope = args[2] if len(args) > 2 else kwargs["scope"]
+        if b"v=" in scope.get("query_string", b""):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "public, max-age=60"
+        return response
+
+try:
+    # Ships with uvicorn[standard]; enables event-driven log polling.
+    from watchfiles import awatch
+except ImportError:  # pragma: no cover
+    awatch = None
 
 logger = logging.getLogger("replexon")
 
@@ -26,59 +51,138 @@ BANNER = r"""
 """
 
 
-async def _poll_logs():
-    """Background task: poll backup log file for new entries."""
-    from app.services.log_parser import parse_incremental
+# Sweep expired sessions every Nth poller pass rather than on the auth
+# path, where deleting them cost a write per request with a stale cookie.
+_SESSION_SWEEP_EVERY = 10
+_tick_count = 0
+
+
+def _poll_tick(initial: bool = False):
+    """One poller pass: sync DB + file work, run off the event loop.
+
+    The first pass after startup runs the full log import; the server is
+    already accepting traffic by then.
+    """
+    global _tick_count
+    from app.services.log_parser import parse_full_log, parse_incremental
     from app.services.backup_runner import check_running_backup
+    from app.services.auth_service import cleanup_expired_sessions
+    from app.services.metrics import invalidate_chart_cache
+
+    db = SessionLocal()
+    try:
+        if initial:
+            count = parse_full_log(db, settings.backup_log_path)
+            if count:
+                logger.info(f"Initial import: {count} backup records from log")
+        else:
+            count = parse_incremental(db, settings.backup_log_path)
+            if count:
+                logger.info(f"Parsed {count} new backup entries from log")
+        if count:
+            invalidate_chart_cache()
+        check_running_backup(db)
+        _tick_count += 1
+        if _tick_count % _SESSION_SWEEP_EVERY == 0:
+            removed = cleanup_expired_sessions(db)
+            if removed:
+                logger.info(f"Removed {removed} expired sessions")
+    finally:
+        db.close()
+
+
+async def _wait_for_log_change():
+    """Wait until the backup log changes, or the poll interval elapses.
+
+    Uses watchfiles for event-driven wakeups when available and the log
+    file exists; otherwise falls back to a plain timed sleep.
+    """
+    if awatch is not None and Path(settings.backup_log_path).exists():
+        try:
+            async def _first_change():
+                async for _ in awatch(settings.backup_log_path):
+                    return
+
+            await asyncio.wait_for(
+                _first_change(), timeout=settings.log_poll_interval
+            )
+            # Debounce: let a burst of writes settle before parsing
+            await asyncio.sleep(1)
+            return
+        except asyncio.TimeoutError:
+            return
+        except Exception:
+            logger.exception("watchfiles failed; falling back to timed polling")
+    await asyncio.sleep(settings.log_poll_interval)
+
+
+async def _poll_logs():
+    """Background task: parse the backup log when it changes."""
+    # Initial full import runs here instead of blocking lifespan startup,
+    # so the server accepts requests while history is still loading.
+    try:
+        await asyncio.to_thread(_poll_tick, initial=True)
+    except Exception:
+        logger.exception("Failed initial log import (non-fatal)")
 
     while True:
         try:
-            await asyncio.sleep(settings.log_poll_interval)
-            db = SessionLocal()
-            try:
-                count = parse_incremental(db, settings.backup_log_path)
-                if count:
-                    logger.info(f"Parsed {count} new backup entries from log")
-                check_running_backup(db)
-            finally:
-                db.close()
+            await _wait_for_log_change()
+            # The parser and backup-status check are synchronous; run them
+            # in a worker thread so they never stall the event loop.
+            await asyncio.to_thread(_poll_tick)
         except asyncio.CancelledError:
             break
         except Exception:
             logger.exception("Error in log poll task")
 
 
+def _acquire_poller_lock():
+    """Claim the log-poller role for this process.
+
+    With uvicorn --workers, every worker runs lifespan; only the one
+    holding the flock on data/poller.lock runs the poller, so SQLite
+    sees a single writer. Returns the open lock file, or None.
+    """
+    try:
+        lock_file = open(Path("data") / "poller.lock", "w")
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return lock_file
+    except OSError:
+        return None
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application startup and shutdown events."""
-    print(BANNER)
+    # Keep the banner for interactive runs; skip it under systemd/log
+    # aggregators where it's just startup noise.
+    if settings.debug or sys.stdout.isatty():
+        print(BANNER)
 
     Path("data").mkdir(exist_ok=True)
     Base.metadata.create_all(bind=engine)
+    ensure_schema()
 
-    # Initial log parse on startup
-    try:
-        from app.services.log_parser import parse_full_log
-        db = SessionLocal()
-        try:
-            count = parse_full_log(db, settings.backup_log_path)
-            if count:
-                logger.info(f"Initial import: {count} backup records from log")
-        finally:
-            db.close()
-    except Exception:
-        logger.exception("Failed initial log import (non-fatal)")
-
-    # Start background log poller
-    poll_task = asyncio.create_task(_poll_logs())
+    # Start background log poller (its first pass does the full import)
+    # in whichever worker wins the lock; the others serve requests only.
+    poll_task = None
+    poller_lock = _acquire_poller_lock()
+    if poller_lock is not None:
+        poll_task = asyncio.create_task(_poll_logs())
+    else:
+        logger.info("Log poller active in another worker; skipping here")
 
     yield
 
-    poll_task.cancel()
-    try:
-        await poll_task
-    except asyncio.CancelledError:
-        pass
+    if poll_task is not None:
+        poll_task.cancel()
+        try:
+            await poll_task
+        except asyncio.CancelledError:
+            pass
+    if poller_lock is not None:
+        poller_lock.close()
 
 
 def create_app() -> FastAPI:
@@ -87,10 +191,15 @@ def create_app() -> FastAPI:
         title=settings.app_name,
         docs_url="/docs" if settings.debug else None,
         redoc_url=None,
+        default_response_class=ORJSONResponse,
         lifespan=lifespan,
     )
 
-    app.mount("/static", StaticFiles(directory="app/static"), name="static")
+    app.mount(
+        "/static",
+        CachedStaticFiles(directory="app/static", html=False),
+        name="static",
+    )
 
     from app.routers import auth, dashboard, logs, schedules, settings_router
 
@@ -106,7 +215,6 @@ def create_app() -> FastAPI:
 
     @app.exception_handler(404)
     async def not_found(request: Request, exc):
-        templates = Jinja2Templates(directory="app/templates")
         return templates.TemplateResponse(
             "pages/error.html",
             {"request": request, "status_code": 404, "message": "Page not found"},
@@ -1,9 +1,10 @@
 """Backup run model for tracking backup history."""
 
 from datetime import datetime, timezone
+from functools import cached_property
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, Float, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Float, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -11,8 +12,21 @@ from app.database import Base
 
 class BackupRun(Base):
     __tablename__ = "backup_runs"
+    # Composite indexes matching the /logs filter + ORDER BY started_at
+    # pattern, so SQLite can emit rows in order instead of sorting the
+    # filtered set.
+    # (started_at, backup_type) additionally covers the tracking-import
+    # dedup read and the enrichment date-range filter without touching
+    # the table.
+    __table_args__ = (
+        Index("ix_backup_type_started", "backup_type", "started_at"),
+        Index("ix_backup_status_started", "status", "started_at"),
+        Index("ix_backup_started_type", "started_at", "backup_type"),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True, default=None
+    )
     backup_type: Mapped[str] = mapped_column(
         String(20), nullable=False, index=True
     )  # daily_mirror | snapshot | cleanup | script_backup | manual
@@ -20,56 +34,64 @@ class BackupRun(Base):
         String(10), nullable=False, index=True
     )  # success | failure | running
     started_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
-    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
-    duration_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    total_size_bytes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    transferred_bytes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    files_transferred: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    raw_log: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, default=None)
+    duration_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True, default=None)
+    total_size_bytes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, default=None)
+    transferred_bytes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, default=None)
+    files_transferred: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, default=None)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True, default=None)
+    raw_log: Mapped[Optional[str]] = mapped_column(Text, nullable=True, default=None)
     triggered_by: Mapped[str] = mapped_column(
         String(10), default="cron", nullable=False
     )  # cron | manual
     email_sent: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # PID of the spawned script for manual runs, so any worker can check
+    # whether a backup is still alive
+    pid: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, default=None)
 
     def __repr__(self) -> str:
         return f"<BackupRun {self.backup_type} {self.status} {self.started_at}>"
 
-    @property
+    @cached_property
     def duration_display(self) -> str:
         """Format duration as human-readable string."""
-        if self.duration_seconds is None:
-            return "-"
-        total = int(self.duration_seconds)
-        if total < 60:
-            return f"{total}s"
-        minutes, seconds = divmod(total, 60)
-        if minutes < 60:
-            return f"{minutes}m {seconds}s"
-        hours, minutes = divmod(minutes, 60)
-        return f"{hours}h {minutes}m {seconds}s"
-
-    @property
+        return format_duration(self.duration_seconds)
+
+    @cached_property
     def size_display(self) -> str:
         """Format total size as human-readable string."""
-        if self.total_size_bytes is None:
-            return "-"
-        return _format_bytes(self.total_size_bytes)
+        return format_bytes(self.total_size_bytes)
 
-    @property
+    @cached_property
     def transferred_display(self) -> str:
         """Format transferred bytes as human-readable string."""
-        if self.transferred_bytes is None:
-            return "-"
-        return _format_bytes(self.transferred_bytes)
+        return format_bytes(self.transferred_bytes)
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Format a duration in seconds as a human-readable string."""
+    if seconds is None:
+        return "-"
+    total = int(seconds)
+    if total < 60:
+        return f"{total}s"
+    minutes, secs = divmod(total, 60)
+    if minutes < 60:
+        return f"{minutes}m {secs}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes}m {secs}s"
+
+
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
 
 
-def _format_bytes(n: int) -> str:
+def format_bytes(n: Optional[int]) -> str:
     """Format byte count to human-readable size."""
-    if abs(n) < 1024:
+    if n is None:
+        return "-"
+    # Unit index straight from the magnitude: powers of 1024 are 10-bit
+    # steps, so no division loop is needed.
+    i = min((abs(n).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1) if n else 0
+    if i <= 0:
         return f"{n} B"
-    for unit in ("KB", "MB", "GB", "TB"):
-        n /= 1024
-        if abs(n) < 1024:
-            return f"{n:.1f} {unit}"
-    return f"{n:.1f} PB"
+    return f"{n / (1 << (10 * i)):.1f} {_BYTE_UNITS[i]}"
@@ -9,25 +9,34 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class User(Base):
     __tablename__ = "users"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True, default=None
+    )
     username: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     password_hash: Mapped[str] = mapped_column(Text, nullable=False)
     is_admin: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+        DateTime, default=None, insert_default=_utcnow, nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        default=None,
+        insert_default=_utcnow,
+        onupdate=_utcnow,
         nullable=False,
     )
 
-    sessions: Mapped[list["Session"]] = relationship(back_populates="user", cascade="all, delete-orphan")
+    sessions: Mapped[list["Session"]] = relationship(
+        back_populates="user", cascade="all, delete-orphan", init=False
+    )
 
     def __repr__(self) -> str:
         return f"<User {self.username}>"
@@ -36,22 +45,30 @@ class User(Base):
 class Session(Base):
     __tablename__ = "sessions"
 
+    # 22 urlsafe-base64 chars = 128 bits of entropy; a third the key width
+    # of the old 64-char hex tokens, tightening the PK index looked up on
+    # every authenticated request. Existing hex ids still match as TEXT.
     id: Mapped[str] = mapped_column(
-        String(64), primary_key=True, default=lambda: secrets.token_hex(32)
+        String(22),
+        primary_key=True,
+        default=None,
+        insert_default=lambda: secrets.token_urlsafe(16),
     )
     user_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+        DateTime, default=None, insert_default=_utcnow, nullable=False
     )
     expires_at: Mapped[datetime] = mapped_column(
         DateTime,
-        default=lambda: datetime.now(timezone.utc) + timedelta(days=30),
+        default=None,
+        insert_default=lambda: datetime.now(timezone.utc) + timedelta(days=30),
         nullable=False,
+        index=True,
     )
 
-    user: Mapped["User"] = relationship(back_populates="sessions")
+    user: Mapped["User"] = relationship(back_populates="sessions", init=False)
 
     @property
     def is_expired(self) -> bool:
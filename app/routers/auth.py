@@ -1,17 +1,17 @@
 """Authentication routes: login and logout."""
 
 from fastapi import APIRouter, Depends, Form, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session as DBSession
 
 from app.dependencies import get_current_user, get_db
 from app.models.user import User
 from app.services.auth_service import authenticate_user, create_session, delete_session
+from app.templating import templates
 from app.utils.security import generate_csrf_token, validate_csrf_token
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/login", response_class=HTMLResponse)
@@ -43,7 +43,8 @@ async def login(
             status_code=400,
         )
 
-    user = authenticate_user(db, username, password)
+    # Argon2 verification takes tens of ms; keep it off the event loop
+    user = await run_in_threadpool(authenticate_user, db, username, password)
     if not user:
         return templates.TemplateResponse(
             "pages/login.html",
@@ -1,10 +1,7 @@
 """Dashboard route: main overview with stats, charts, and recent backups."""
 
-import json
-
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session as DBSession
 
 from app.config import settings
@@ -12,14 +9,13 @@ from app.dependencies import get_current_user, get_db
 from app.models.setting import AppSetting
 from app.models.user import User
 from app.services.metrics import (
-    get_backup_type_counts,
-    get_daily_sizes,
+    get_chart_json,
     get_dashboard_stats,
     get_recent_backups,
 )
+from app.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/dashboard", response_class=HTMLResponse)
@@ -31,15 +27,17 @@ async def dashboard(
 ):
     """Main dashboard page."""
     stats = get_dashboard_stats(db, days=days)
-    type_counts = get_backup_type_counts(db, days=days)
-    daily_sizes = get_daily_sizes(db, days=days)
+    type_counts_json, daily_sizes_json = get_chart_json(db, days=days)
     recent = get_recent_backups(db, limit=10)
 
-    # Read backup paths from DB, falling back to config
-    dest_row = db.query(AppSetting).filter(AppSetting.key == "backup_destination").first()
-    backup_destination = dest_row.value if dest_row else settings.backup_destination
-    path_row = db.query(AppSetting).filter(AppSetting.key == "plex_data_path").first()
-    plex_data_path = path_row.value if path_row else settings.plex_data_path
+    # Read backup paths from DB in one query, falling back to config
+    settings_map = dict(
+        db.query(AppSetting.key, AppSetting.value)
+        .filter(AppSetting.key.in_(("backup_destination", "plex_data_path")))
+        .all()
+    )
+    backup_destination = settings_map.get("backup_destination", settings.backup_destination)
+    plex_data_path = settings_map.get("plex_data_path", settings.plex_data_path)
 
     return templates.TemplateResponse(
         "pages/dashboard.html",
@@ -48,8 +46,8 @@ async def dashboard(
             "user": user,
             "active_page": "dashboard",
             "stats": stats,
-            "type_counts_json": json.dumps(type_counts),
-            "daily_sizes_json": json.dumps(daily_sizes),
+            "type_counts_json": type_counts_json,
+            "daily_sizes_json": daily_sizes_json,
             "recent_backups": recent,
             "selected_days": days,
             "backup_destination": backup_destination,
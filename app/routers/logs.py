@@ -1,16 +1,86 @@
 """Log viewer routes: filterable backup history."""
 
+import time
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session as DBSession
 
 from app.dependencies import get_current_user, get_db
-from app.models.backup import BackupRun
+from app.models.backup import BackupRun, format_bytes, format_duration
 from app.models.user import User
+from app.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+
+
+class LogRow(NamedTuple):
+    """Projected BackupRun columns for the list view.
+
+    Skips raw_log (TEXT, potentially large) so the paginated table never
+    materializes full rsync output; the detail view loads the full row.
+    """
+
+    id: int
+    backup_type: str
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime]
+    duration_seconds: Optional[float]
+    total_size_bytes: Optional[int]
+    transferred_bytes: Optional[int]
+    error_message: Optional[str]
+    triggered_by: str
+
+    @property
+    def duration_display(self) -> str:
+        return format_duration(self.duration_seconds)
+
+    @property
+    def size_display(self) -> str:
+        return format_bytes(self.total_size_bytes)
+
+    @property
+    def transferred_display(self) -> str:
+        return format_bytes(self.transferred_bytes)
+
+
+# COUNT(*) over the filtered set is a full scan in SQLite and runs on
+# every page view with identical filters while the user pages through
+# results. Cache totals briefly, keyed by the filter combination.
+_count_cache: Dict[Tuple[str, str, str], Tuple[float, int]] = {}
+_COUNT_CACHE_TTL = 10
+_COUNT_CACHE_MAX = 256
+
+
+def _cached_count(query, backup_type: str, status: str, search: str) -> int:
+    """Return the filtered row count, cached for a few seconds."""
+    key = (backup_type, status, search)
+    entry = _count_cache.get(key)
+    now = time.monotonic()
+    if entry is not None and now - entry[0] < _COUNT_CACHE_TTL:
+        return entry[1]
+    total = query.count()
+    if len(_count_cache) >= _COUNT_CACHE_MAX:
+        _count_cache.clear()
+    _count_cache[key] = (now, total)
+    return total
+
+
+LIST_COLUMNS = (
+    BackupRun.id,
+    BackupRun.backup_type,
+    BackupRun.status,
+    BackupRun.started_at,
+    BackupRun.finished_at,
+    BackupRun.duration_seconds,
+    BackupRun.total_size_bytes,
+    BackupRun.transferred_bytes,
+    BackupRun.error_message,
+    BackupRun.triggered_by,
+)
 
 
 @router.get("/logs", response_class=HTMLResponse)
@@ -34,13 +104,15 @@ async def logs_page(
     if search:
         query = query.filter(BackupRun.raw_log.contains(search))
 
-    total = query.count()
-    backups = (
-        query.order_by(BackupRun.started_at.desc())
+    total = _cached_count(query, backup_type, status, search)
+    backups = [
+        LogRow(*row)
+        for row in query.with_entities(*LIST_COLUMNS)
+        .order_by(BackupRun.started_at.desc())
         .offset((page - 1) * per_page)
         .limit(per_page)
         .all()
-    )
+    ]
     total_pages = max(1, (total + per_page - 1) // per_page)
 
     ctx = {
@@ -71,7 +143,7 @@ async def backup_detail(
     db: DBSession = Depends(get_db),
 ):
     """Single backup run detail view."""
-    backup = db.query(BackupRun).filter(BackupRun.id == backup_id).first()
+    backup = db.get(BackupRun, backup_id)
     if not backup:
         return templates.TemplateResponse(
             "pages/error.html",
@@ -2,7 +2,6 @@
 
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session as DBSession
 
 from app.config import settings
@@ -10,10 +9,10 @@ from app.dependencies import get_current_user, get_db
 from app.models.user import User
 from app.services.backup_runner import can_trigger_backup, trigger_backup
 from app.services.cron_service import get_backup_cron_entries, update_cron_entry
+from app.templating import templates
 from app.utils.security import generate_csrf_token, validate_csrf_token
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/schedules", response_class=HTMLResponse)
@@ -24,7 +23,7 @@ async def schedules_page(
 ):
     """Display backup schedules from crontab."""
     entries = get_backup_cron_entries()
-    can_run, cooldown_msg = can_trigger_backup()
+    can_run, cooldown_msg = can_trigger_backup(db)
 
     return templates.TemplateResponse(
         "pages/schedules.html",
@@ -1,11 +1,16 @@
 """Settings routes: email config, paths, password change, about."""
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Optional
 
+from datetime import datetime, timezone
+
 from fastapi import APIRouter, Depends, Form, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session as DBSession
 
 from app.config import settings
@@ -13,10 +18,12 @@ from app.dependencies import get_current_user, get_db
 from app.models.setting import AppSetting
 from app.models.user import User
 from app.services.auth_service import hash_password, verify_password
+from app.services.email_service import send_test_email
+from app.templating import templates
 from app.utils.security import generate_csrf_token, validate_csrf_token
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+
 
 # Default SMTP settings (Gmail as example)
 SMTP_DEFAULTS = {
@@ -29,52 +36,84 @@ SMTP_DEFAULTS = {
 
 
 def _get_setting(db: DBSession, key: str, default: str = "") -> str:
-    row = db.query(AppSetting).filter(AppSetting.key == key).first()
+    row = db.get(AppSetting, key)
     return row.value if row else default
 
 
-def _set_setting(db: DBSession, key: str, value: str) -> None:
-    row = db.query(AppSetting).filter(AppSetting.key == key).first()
-    if row:
-        row.value = value
-    else:
-        row = AppSetting(key=key, value=value)
-        db.add(row)
+def _get_settings_bulk(db: DBSession, keys) -> Dict[str, str]:
+    """Fetch several app settings with a single IN query."""
+    return dict(
+        db.query(AppSetting.key, AppSetting.value)
+        .filter(AppSetting.key.in_(tuple(keys)))
+        .all()
+    )
+
+
+def _set_settings_bulk(db: DBSession, mapping: Dict[str, str]) -> None:
+    """Upsert several app settings in one statement and one commit."""
+    now = datetime.now(timezone.utc)
+    stmt = sqlite_insert(AppSetting).values(
+        [{"key": k, "value": v, "updated_at": now} for k, v in mapping.items()]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["key"],
+        set_={"value": stmt.excluded.value, "updated_at": now},
+    )
+    db.execute(stmt)
     db.commit()
 
 
+def _set_setting(db: DBSession, key: str, value: str) -> None:
+    _set_settings_bulk(db, {key: value})
+
+
+@lru_cache(maxsize=4)
+def _parse_msmtp(path_str: str, mtime_ns: int) -> Dict[str, str]:
+    """Parse an msmtp config file. Cached per (path, mtime)."""
+    config = {}
+    try:
+        for line in Path(path_str).read_text().splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = line.split(None, 1)
+            if len(parts) == 2:
+                key, value = parts
+                if key.lower() in ("password", "passwordeval"):
+                    continue
+                config[key.lower()] = value
+    except PermissionError:
+        pass
+    return config
+
+
 def _try_read_msmtp() -> Dict[str, str]:
     """Try to read msmtp config as fallback defaults for first-time setup.
 
     This provides a nice experience on servers that already have msmtp
     configured -- the SMTP fields pre-populate with existing values.
     Returns empty dict if msmtp is not installed or not readable.
+    The parse is memoized on the file's mtime, so repeat settings-page
+    loads cost one stat() instead of a read + line parse.
     """
-    config = {}
     for msmtp_path in [Path.home() / ".msmtprc", Path("/etc/msmtprc")]:
-        if msmtp_path.exists():
-            try:
-                for line in msmtp_path.read_text().splitlines():
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    parts = line.split(None, 1)
-                    if len(parts) == 2:
-                        key, value = parts
-                        if key.lower() in ("password", "passwordeval"):
-                            continue
-                        config[key.lower()] = value
-            except PermissionError:
-                pass
-            break
-    return config
+        try:
+            mtime_ns = msmtp_path.stat().st_mtime_ns
+        except OSError:
+            continue
+        return _parse_msmtp(str(msmtp_path), mtime_ns)
+    return {}
+
 
+def _get_smtp_settings(db: DBSession, stored: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Get SMTP settings from app_settings, falling back to msmtp config.
 
-def _get_smtp_settings(db: DBSession) -> Dict[str, str]:
-    """Get SMTP settings from app_settings, falling back to msmtp config."""
-    result = {}
-    for key, default in SMTP_DEFAULTS.items():
-        result[key] = _get_setting(db, key, "")
+    `stored` lets callers pass an already-fetched settings map to avoid
+    a second query.
+    """
+    if stored is None:
+        stored = _get_settings_bulk(db, SMTP_DEFAULTS)
+    result = {key: stored.get(key, "") for key in SMTP_DEFAULTS}
     # If nothing configured yet, try msmtp as initial defaults
     if not result["smtp_host"]:
         msmtp = _try_read_msmtp()
@@ -99,9 +138,12 @@ async def settings_page(
     db: DBSession = Depends(get_db),
 ):
     """Settings page."""
-    smtp = _get_smtp_settings(db)
-    backup_destination = _get_setting(db, "backup_destination", settings.backup_destination)
-    plex_data_path = _get_setting(db, "plex_data_path", settings.plex_data_path)
+    stored = _get_settings_bulk(
+        db, SMTP_DEFAULTS.keys() | {"backup_destination", "plex_data_path"}
+    )
+    smtp = _get_smtp_settings(db, stored)
+    backup_destination = stored.get("backup_destination", settings.backup_destination)
+    plex_data_path = stored.get("plex_data_path", settings.plex_data_path)
 
     return templates.TemplateResponse(
         "pages/settings.html",
@@ -140,6 +182,32 @@ async def update_email_settings(
     return RedirectResponse(url="/settings?success=Email+settings+updated", status_code=303)
 
 
+class SmtpSettingsForm(BaseModel):
+    """Validated SMTP form: one parse pass replaces the per-field
+    strip/if branches, with friendly messages for the redirect."""
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    smtp_host: str
+    smtp_port: int = Field(default=587, ge=1, le=65535)
+    smtp_from: str
+    smtp_tls: str = "off"
+
+    @field_validator("smtp_host")
+    @classmethod
+    def _host_required(cls, v: str) -> str:
+        if not v:
+            raise ValueError("SMTP host is required")
+        return v
+
+    @field_validator("smtp_from")
+    @classmethod
+    def _from_is_address(cls, v: str) -> str:
+        if not v or "@" not in v:
+            raise ValueError("Valid from address is required")
+        return v
+
+
 @router.post("/settings/smtp")
 async def update_smtp_settings(
     request: Request,
@@ -155,15 +223,25 @@ async def update_smtp_settings(
     if not validate_csrf_token(csrf_token):
         return RedirectResponse(url="/settings", status_code=303)
 
-    if not smtp_host.strip():
-        return RedirectResponse(url="/settings?error=SMTP+host+is+required", status_code=303)
-    if not smtp_from.strip() or "@" not in smtp_from:
-        return RedirectResponse(url="/settings?error=Valid+from+address+is+required", status_code=303)
-
-    _set_setting(db, "smtp_host", smtp_host.strip())
-    _set_setting(db, "smtp_port", smtp_port.strip())
-    _set_setting(db, "smtp_from", smtp_from.strip())
-    _set_setting(db, "smtp_tls", smtp_tls.strip())
+    try:
+        form = SmtpSettingsForm(
+            smtp_host=smtp_host,
+            smtp_port=smtp_port,
+            smtp_from=smtp_from,
+            smtp_tls=smtp_tls,
+        )
+    except ValidationError as e:
+        msg = e.errors()[0]["msg"].removeprefix("Value error, ")
+        return RedirectResponse(
+            url="/settings?error=" + msg.replace(" ", "+"), status_code=303
+        )
+
+    _set_settings_bulk(db, {
+        "smtp_host": form.smtp_host,
+        "smtp_port": str(form.smtp_port),
+        "smtp_from": form.smtp_from,
+        "smtp_tls": form.smtp_tls,
+    })
     return RedirectResponse(url="/settings?success=SMTP+settings+updated", status_code=303)
 
 
@@ -180,8 +258,10 @@ async def update_backup_info(
     if not validate_csrf_token(csrf_token):
         return RedirectResponse(url="/settings", status_code=303)
 
-    _set_setting(db, "backup_destination", backup_destination.strip())
-    _set_setting(db, "plex_data_path", plex_data_path.strip())
+    _set_settings_bulk(db, {
+        "backup_destination": backup_destination.strip(),
+        "plex_data_path": plex_data_path.strip(),
+    })
     return RedirectResponse(url="/settings?success=Backup+info+updated", status_code=303)
 
 
@@ -196,8 +276,7 @@ async def test_email(
     if not validate_csrf_token(csrf_token):
         return RedirectResponse(url="/settings", status_code=303)
 
-    from app.services.email_service import send_test_email
-    success, message = send_test_email(db)
+    success, message = await send_test_email(db)
 
     if success:
         return RedirectResponse(url="/settings?success=" + message.replace(" ", "+"), status_code=303)
@@ -224,9 +303,10 @@ async def change_password(
     if len(new_password) < 8:
         return RedirectResponse(url="/settings?error=Password+must+be+at+least+8+characters", status_code=303)
 
-    if not verify_password(current_password, user.password_hash):
+    # Argon2 calls block for tens of ms; run them off the event loop
+    if not await run_in_threadpool(verify_password, current_password, user.password_hash):
         return RedirectResponse(url="/settings?error=Current+password+is+incorrect", status_code=303)
 
-    user.password_hash = hash_password(new_password)
+    user.password_hash = await run_in_threadpool(hash_password, new_password)
     db.commit()
     return RedirectResponse(url="/settings?success=Password+changed", status_code=303)
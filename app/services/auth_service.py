@@ -1,16 +1,31 @@
 """Authentication service: password hashing and session management."""
 
+import os
 import secrets
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
+from sqlalchemy import delete
 from sqlalchemy.orm import Session as DBSession
 
 from app.models.user import Session, User
 
-_ph = PasswordHasher()
+# Argon2 is memory-hard; with the same time/memory cost, lane count
+# scaled to the core count cuts wall time roughly linearly without
+# lowering the security level. Existing hashes still verify (parameters
+# are encoded in the hash) and are upgraded on the next successful
+# login via check_needs_rehash.
+_ph = PasswordHasher(
+    time_cost=2,
+    memory_cost=65536,  # KiB
+    parallelism=os.cpu_count() or 2,
+)
+
+# Verified against on unknown usernames so that path costs the same as a
+# real verify (one Argon2 pass), instead of re-hashing from scratch.
+_DUMMY_HASH = _ph.hash("dummy-password")
 
 
 def hash_password(password: str) -> str:
@@ -29,38 +44,49 @@ def verify_password(password: str, password_hash: str) -> bool:
 def create_session(db: DBSession, user: User, days: int = 30) -> Session:
     """Create a new session for the given user."""
     session = Session(
-        id=secrets.token_hex(32),
+        id=secrets.token_urlsafe(16),
         user_id=user.id,
         expires_at=datetime.now(timezone.utc) + timedelta(days=days),
     )
     db.add(session)
     db.commit()
-    db.refresh(session)
+    # No refresh: id and expires_at are set client-side, so re-reading
+    # the row would just add a SELECT per login.
     return session
 
 
 def delete_session(db: DBSession, session_token: str) -> None:
     """Delete a session by its token."""
-    session = db.query(Session).filter(Session.id == session_token).first()
+    from app.dependencies import invalidate_session_cache
+
+    session = db.get(Session, session_token)
     if session:
         db.delete(session)
         db.commit()
+    invalidate_session_cache(session_token)
 
 
 def cleanup_expired_sessions(db: DBSession) -> int:
-    """Remove all expired sessions. Returns count deleted."""
+    """Remove all expired sessions. Returns count deleted.
+
+    Issued as a single bulk DELETE so expired rows are never fetched
+    into Python just to be discarded.
+    """
     now = datetime.now(timezone.utc)
-    count = db.query(Session).filter(Session.expires_at < now).delete()
+    result = db.execute(delete(Session).where(Session.expires_at < now))
     db.commit()
-    return count
+    return result.rowcount
 
 
 def authenticate_user(db: DBSession, username: str, password: str) -> Optional[User]:
     """Authenticate a user by username and password. Returns User or None."""
     user = db.query(User).filter(User.username == username).first()
     if not user:
-        _ph.hash("dummy-password")
+        verify_password(password, _DUMMY_HASH)
         return None
     if not verify_password(password, user.password_hash):
         return None
+    if _ph.check_needs_rehash(user.password_hash):
+        user.password_hash = _ph.hash(password)
+        db.commit()
     return user
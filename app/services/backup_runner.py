@@ -1,34 +1,95 @@
-"""Trigger manual backup via subprocess with rate limiting."""
+"""Trigger manual backup via subprocess with rate limiting.
 
+Running/cooldown state lives in the backup_runs table (status + pid)
+rather than module globals, so every uvicorn worker sees the same
+picture. Whichever worker spawned the script reaps and finalizes its
+own child from a waiter thread; the poller only cleans up rows whose
+spawning worker is gone.
+"""
+
+import os
 import subprocess
-import time
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional, Tuple, Union
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session as DBSession
 
-from app.config import settings
+from app.config import BASE_DIR, settings
+from app.database import SessionLocal
 from app.models.backup import BackupRun
 
-_last_trigger_time: float = 0
-_running_process: Optional[subprocess.Popen] = None
+# Serializes the can-trigger check with the spawn, so two concurrent
+# trigger requests in this process can't both pass the check and both
+# start a backup. Cross-worker, the second spawn is caught by the
+# pid-alive check against the committed running row.
+_trigger_lock = threading.Lock()
+
+# How much of the tail of a manual backup's output to keep in raw_log
+RAW_LOG_TAIL_BYTES = 64 * 1024
+
+
+def _manual_log_path(run_id: int) -> Path:
+    """On-disk output file for a manual backup run."""
+    return BASE_DIR / "data" / f"manual-backup-{run_id}.log"
+
+
+def _read_log_tail(path: Path, max_bytes: int = RAW_LOG_TAIL_BYTES) -> str:
+    """Read at most the last max_bytes of a log file."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, 2)
+            size = f.tell()
+            f.seek(max(0, size - max_bytes))
+            return f.read().decode("utf-8", errors="replace")
+    except OSError:
+        return ""
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process with this PID exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
 
+def _seconds_since(started_at: datetime) -> float:
+    now = datetime.now(timezone.utc)
+    if started_at.tzinfo is None:
+        now = now.replace(tzinfo=None)
+    return (now - started_at).total_seconds()
 
-def can_trigger_backup() -> Tuple[bool, str]:
+
+def can_trigger_backup(db: DBSession) -> Tuple[bool, str]:
     """Check if a manual backup can be triggered.
 
     Returns (can_trigger, reason_if_not).
     """
-    global _running_process
-
-    if _running_process is not None and _running_process.poll() is None:
+    running = (
+        db.query(BackupRun)
+        .filter(BackupRun.status == "running", BackupRun.triggered_by == "manual")
+        .order_by(BackupRun.started_at.desc())
+        .first()
+    )
+    if running is not None and running.pid and _pid_alive(running.pid):
         return False, "A backup is already running"
 
-    elapsed = time.time() - _last_trigger_time
-    if elapsed < settings.backup_cooldown:
-        remaining = int(settings.backup_cooldown - elapsed)
-        return False, f"Cooldown active. Try again in {remaining}s"
+    last_started = (
+        db.query(func.max(BackupRun.started_at))
+        .filter(BackupRun.triggered_by == "manual")
+        .scalar()
+    )
+    if last_started is not None:
+        elapsed = _seconds_since(last_started)
+        if elapsed < settings.backup_cooldown:
+            remaining = int(settings.backup_cooldown - elapsed)
+            return False, f"Cooldown active. Try again in {remaining}s"
 
     return True, ""
 
@@ -38,9 +99,14 @@ def trigger_backup(db: DBSession, script_path: Optional[str] = None) -> Union[Ba
 
     Returns a BackupRun record on success, or an error string.
     """
-    global _last_trigger_time, _running_process
+    with _trigger_lock:
+        return _trigger_backup_locked(db, script_path)
 
-    can, reason = can_trigger_backup()
+
+def _trigger_backup_locked(
+    db: DBSession, script_path: Optional[str]
+) -> Union[BackupRun, str]:
+    can, reason = can_trigger_backup(db)
     if not can:
         return reason
 
@@ -56,18 +122,24 @@ def trigger_backup(db: DBSession, script_path: Optional[str] = None) -> Union[Ba
         started_at=datetime.now(timezone.utc),
         triggered_by="manual",
     )
+    # Flush (not commit) to get the run id for the log filename: the
+    # running row and its pid must become visible in one commit, or a
+    # poller tick landing in between would finalize the pid-less row as
+    # an orphan.
     db.add(run)
-    db.commit()
-    db.refresh(run)
+    db.flush()
 
     try:
-        _running_process = subprocess.Popen(
-            ["bash", script_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-        )
-        _last_trigger_time = time.time()
+        # Send output straight to disk so multi-GB rsync logs never
+        # accumulate in a Python-side pipe buffer.
+        with open(_manual_log_path(run.id), "wb") as log_file:
+            process = subprocess.Popen(
+                ["bash", script_path],
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+            )
+        run.pid = process.pid
+        db.commit()
     except OSError as e:
         run.status = "failure"
         run.error_message = str(e)
@@ -75,39 +147,66 @@ def trigger_backup(db: DBSession, script_path: Optional[str] = None) -> Union[Ba
         db.commit()
         return str(e)
 
-    return run
-
+    # Reap and finalize in this worker: only the parent can wait() on
+    # the child, and with --workers the poller usually lives elsewhere.
+    # Without this, the exited child stays a zombie, signal-0 keeps
+    # reporting it alive, and the run row never leaves "running".
+    threading.Thread(
+        target=_reap_backup,
+        args=(run.id, process),
+        name=f"backup-reaper-{run.id}",
+        daemon=True,
+    ).start()
 
-def check_running_backup(db: DBSession) -> None:
-    """Check if a running backup has finished and update its record."""
-    global _running_process
+    return run
 
-    if _running_process is None or _running_process.poll() is None:
-        return
 
-    returncode = _running_process.returncode
-    stdout = _running_process.stdout.read() if _running_process.stdout else ""
-    _running_process = None
+def _reap_backup(run_id: int, process: subprocess.Popen) -> None:
+    """Wait for our own backup child and record its outcome."""
+    returncode = process.wait()
+    db = SessionLocal()
+    try:
+        run = db.get(BackupRun, run_id)
+        if run is not None and run.status == "running":
+            _finalize_run(db, run, returncode)
+    finally:
+        db.close()
 
-    run = (
-        db.query(BackupRun)
-        .filter(BackupRun.status == "running", BackupRun.triggered_by == "manual")
-        .order_by(BackupRun.started_at.desc())
-        .first()
-    )
-    if not run:
-        return
 
+def _finalize_run(db: DBSession, run: BackupRun, returncode: Optional[int]) -> None:
+    """Record the outcome of a finished (or vanished) manual backup."""
     run.finished_at = datetime.now(timezone.utc)
-    run.raw_log = stdout
+    run.raw_log = _read_log_tail(_manual_log_path(run.id))
     if run.started_at:
-        delta = run.finished_at - run.started_at
-        run.duration_seconds = delta.total_seconds()
+        run.duration_seconds = _seconds_since(run.started_at)
 
     if returncode == 0:
         run.status = "success"
+    elif returncode is None:
+        # Spawned by a process that is gone (e.g. a restart); the exit
+        # code is unrecoverable.
+        run.status = "failure"
+        run.error_message = "Backup process no longer running (exit status unknown)"
     else:
         run.status = "failure"
         run.error_message = f"Script exited with code {returncode}"
 
     db.commit()
+
+
+def check_running_backup(db: DBSession) -> None:
+    """Finalize running rows whose spawning worker is gone.
+
+    Live children are reaped by their own worker's waiter thread; this
+    only catches rows orphaned by a worker crash or restart, where the
+    pid no longer exists (the child gets reparented and reaped by init,
+    so signal-0 is reliable here).
+    """
+    runs = (
+        db.query(BackupRun)
+        .filter(BackupRun.status == "running", BackupRun.triggered_by == "manual")
+        .all()
+    )
+    for run in runs:
+        if not run.pid or not _pid_alive(run.pid):
+            _finalize_run(db, run, None)
@@ -1,8 +1,10 @@
 """Read and optionally modify crontab entries for backup schedules."""
 
 import subprocess
+import time
 from dataclasses import dataclass
-from typing import List
+from functools import cached_property
+from typing import List, Optional, Tuple
 
 from app.config import settings
 
@@ -13,6 +15,11 @@ SCRIPT_LABELS = {
     "backup-scripts": "Monthly Config Backup",
 }
 
+DAY_NAMES = {
+    "0": "Sundays", "1": "Mondays", "2": "Tuesdays", "3": "Wednesdays",
+    "4": "Thursdays", "5": "Fridays", "6": "Saturdays", "7": "Sundays",
+}
+
 
 @dataclass
 class CronEntry:
@@ -24,7 +31,7 @@ class CronEntry:
     command: str
     raw_line: str
 
-    @property
+    @cached_property
     def label(self) -> str:
         """Friendly name based on the script."""
         cmd_lower = self.command.lower()
@@ -33,16 +40,12 @@ class CronEntry:
                 return label
         return self.command.split("/")[-1] if "/" in self.command else self.command
 
-    @property
+    @cached_property
     def schedule_display(self) -> str:
-        """Human-readable schedule description."""
+        """Human-readable schedule description. Computed once per entry."""
         parts = []
         if self.dow != "*":
-            day_names = {
-                "0": "Sundays", "1": "Mondays", "2": "Tuesdays", "3": "Wednesdays",
-                "4": "Thursdays", "5": "Fridays", "6": "Saturdays", "7": "Sundays",
-            }
-            days = [day_names.get(d.strip(), d.strip()) for d in self.dow.split(",")]
+            days = [DAY_NAMES.get(d.strip(), d.strip()) for d in self.dow.split(",")]
             parts.append(", ".join(days))
         elif self.dom != "*":
             if self.dom == "1":
@@ -68,8 +71,34 @@ class CronEntry:
         return f"{self.minute} {self.hour} {self.dom} {self.month} {self.dow}"
 
 
+# Reading the crontab forks sudo (PAM auth included) and is called on
+# every dashboard render; cache the raw text for a few seconds.
+_crontab_cache: Optional[Tuple[float, str]] = None
+_CRONTAB_CACHE_TTL = 5
+
+
+def _invalidate_crontab_cache() -> None:
+    global _crontab_cache
+    _crontab_cache = None
+
+
 def _read_crontab() -> str:
-    """Read crontab for the configured user, using sudo if needed."""
+    """Read crontab for the configured user, using sudo if needed.
+
+    The result is cached briefly; edits go through update_cron_entry,
+    which invalidates the cache on success.
+    """
+    global _crontab_cache
+    if _crontab_cache is not None:
+        cached_at, text = _crontab_cache
+        if time.monotonic() - cached_at < _CRONTAB_CACHE_TTL:
+            return text
+    text = _read_crontab_uncached()
+    _crontab_cache = (time.monotonic(), text)
+    return text
+
+
+def _read_crontab_uncached() -> str:
     try:
         result = subprocess.run(
             ["sudo", "crontab", "-l", "-u", settings.cron_user],
@@ -114,21 +143,36 @@ def get_backup_cron_entries() -> List[CronEntry]:
 def update_cron_entry(old_line: str, new_line: str) -> bool:
     """Replace a cron entry. Requires CRON_EDIT_ENABLED=true.
 
+    Matches whole lines only -- a plain str.replace would corrupt the
+    crontab if old_line happened to be a substring of another entry.
     Returns True on success.
     """
     if not settings.cron_edit_enabled:
         return False
+    if old_line == new_line:
+        return True
 
     current = _read_crontab()
-    if not current or old_line not in current:
+    if not current:
         return False
 
+    lines = current.splitlines(keepends=True)
+    idx = next(
+        (i for i, line in enumerate(lines) if line.rstrip("\n") == old_line), None
+    )
+    if idx is None:
+        return False
+    lines[idx] = new_line + "\n"
+
     try:
-        new_crontab = current.replace(old_line, new_line)
+        new_crontab = "".join(lines)
         proc = subprocess.run(
             ["sudo", "crontab", "-u", settings.cron_user, "-"],
             input=new_crontab, capture_output=True, text=True, timeout=10,
         )
-        return proc.returncode == 0
+        if proc.returncode == 0:
+            _invalidate_crontab_cache()
+            return True
+        return False
     except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
         return False
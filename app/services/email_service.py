@@ -6,32 +6,46 @@ Strategy:
   that don't require auth, e.g. internal relays).
 """
 
+import asyncio
 import shutil
-import smtplib
-import subprocess
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Tuple
+from typing import Dict, Tuple
 
+import aiosmtplib
 from sqlalchemy.orm import Session as DBSession
 
 from app.models.setting import AppSetting
 
+# Resolved once: which() walks $PATH, and the answer doesn't change for
+# the lifetime of the process.
+_MSMTP_BIN = shutil.which("msmtp")
 
-def _get_setting(db: DBSession, key: str, default: str = "") -> str:
-    row = db.query(AppSetting).filter(AppSetting.key == key).first()
-    return row.value if row else default
 
+# Everything a send needs, fetched with one IN query up front.
+_SEND_SETTING_KEYS = (
+    "email_recipient", "smtp_from", "smtp_host", "smtp_port", "smtp_tls",
+)
 
-def _get_recipient(db: DBSession) -> str:
-    return _get_setting(db, "email_recipient")
 
+def _get_send_settings(db: DBSession) -> Dict[str, str]:
+    return dict(
+        db.query(AppSetting.key, AppSetting.value)
+        .filter(AppSetting.key.in_(_SEND_SETTING_KEYS))
+        .all()
+    )
+
+
+def _build_message_template() -> str:
+    """Serialize the static test message once, with header placeholders.
 
-def _build_test_message(from_addr: str, to_addr: str) -> MIMEMultipart:
+    Everything except From/To is fixed, so the MIME assembly (part
+    encoding, boundary generation) happens at import instead of per send.
+    """
     msg = MIMEMultipart("alternative")
     msg["Subject"] = "RePlexOn - Test Notification"
-    msg["From"] = from_addr
-    msg["To"] = to_addr
+    msg["From"] = "{FROM}"
+    msg["To"] = "{TO}"
 
     text = (
         "This is a test email from RePlexOn.\n\n"
@@ -49,62 +63,86 @@ def _build_test_message(from_addr: str, to_addr: str) -> MIMEMultipart:
 
     msg.attach(MIMEText(text, "plain"))
     msg.attach(MIMEText(html, "html"))
-    return msg
+    return msg.as_string()
+
+
+_TEST_MESSAGE_TEMPLATE = _build_message_template()
+
 
+def _render_test_message(from_addr: str, to_addr: str) -> str:
+    return _TEST_MESSAGE_TEMPLATE.format(FROM=from_addr, TO=to_addr)
 
-def _send_via_msmtp(to_addr: str, msg: MIMEMultipart) -> Tuple[bool, str]:
+
+async def _send_via_msmtp(to_addr: str, message: str) -> Tuple[bool, str]:
     """Send email using msmtp (uses system-stored credentials)."""
     try:
-        result = subprocess.run(
-            ["msmtp", "-t"],
-            input=msg.as_string(),
-            capture_output=True, text=True, timeout=30,
+        proc = await asyncio.create_subprocess_exec(
+            _MSMTP_BIN, "-t",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
-        if result.returncode == 0:
-            return True, "Test email sent via msmtp"
-        return False, f"msmtp error: {result.stderr.strip()}"
-    except subprocess.TimeoutExpired:
-        return False, "msmtp timed out"
     except FileNotFoundError:
         return False, "msmtp not found"
+    try:
+        _, stderr = await asyncio.wait_for(
+            proc.communicate(message.encode()), timeout=30
+        )
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return False, "msmtp timed out"
+    if proc.returncode == 0:
+        return True, "Test email sent via msmtp"
+    return False, f"msmtp error: {stderr.decode().strip()}"
 
 
-def _send_via_smtp(db: DBSession, to_addr: str, msg: MIMEMultipart) -> Tuple[bool, str]:
+async def _send_via_smtp(
+    cfg: Dict[str, str], to_addr: str, from_addr: str, message: str
+) -> Tuple[bool, str]:
     """Send email using direct SMTP (no auth - for internal relays)."""
-    host = _get_setting(db, "smtp_host")
-    port = int(_get_setting(db, "smtp_port", "587") or "587")
-    tls = _get_setting(db, "smtp_tls", "on") == "on"
+    host = cfg.get("smtp_host", "")
+    port = int(cfg.get("smtp_port") or "587")
+    tls = cfg.get("smtp_tls", "on") == "on"
 
     if not host:
         return False, "SMTP host is not configured"
 
     try:
-        server = smtplib.SMTP(host, port, timeout=15)
-        if tls:
-            server.starttls()
-        server.sendmail(msg["From"], [to_addr], msg.as_string())
-        server.quit()
+        await aiosmtplib.send(
+            message,
+            sender=from_addr,
+            recipients=[to_addr],
+            hostname=host,
+            port=port,
+            # Explicit False when TLS is off: None means "upgrade if the
+            # server offers STARTTLS", which breaks plaintext-only relays
+            # with self-signed certs.
+            start_tls=tls,
+            timeout=15,
+        )
         return True, "Test email sent via SMTP"
-    except smtplib.SMTPSenderRefused:
+    except aiosmtplib.SMTPSenderRefused:
         return False, "SMTP server requires authentication (configure msmtp on the server)"
-    except smtplib.SMTPException as e:
+    except aiosmtplib.SMTPException as e:
         return False, f"SMTP error: {e}"
     except OSError as e:
         return False, f"Connection error: {e}"
 
 
-def send_test_email(db: DBSession) -> Tuple[bool, str]:
+async def send_test_email(db: DBSession) -> Tuple[bool, str]:
     """Send a test email. Uses msmtp if available, else direct SMTP."""
-    recipient = _get_recipient(db)
+    cfg = _get_send_settings(db)
+    recipient = cfg.get("email_recipient", "")
     if not recipient:
         return False, "Email recipient is not configured"
 
-    from_addr = _get_setting(db, "smtp_from") or recipient
-    msg = _build_test_message(from_addr, recipient)
+    from_addr = cfg.get("smtp_from") or recipient
+    message = _render_test_message(from_addr, recipient)
 
     # Prefer msmtp if installed (has stored credentials)
-    if shutil.which("msmtp"):
-        return _send_via_msmtp(recipient, msg)
+    if _MSMTP_BIN is not None:
+        return await _send_via_msmtp(recipient, message)
 
     # Fall back to direct SMTP
-    return _send_via_smtp(db, recipient, msg)
+    return await _send_via_smtp(cfg, recipient, from_addr, message)
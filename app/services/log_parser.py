@@ -11,24 +11,40 @@ Strategy:
 - The tracking file is the reliable source; the main log adds optional detail
 """
 
+import json
+import mmap
+import os
 import re
-import subprocess
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session as DBSession
 
 from app.models.backup import BackupRun
 
 # Patterns for the main log file
-BACKUP_START_RE = re.compile(r"=== Plex Backup Started: (.+?) ===")
-BACKUP_SUCCESS_RE = re.compile(r"=== Plex Backup Completed Successfully: (.+?) ===")
-BACKUP_FAILED_RE = re.compile(r"=== Plex Backup FAILED with code (\d+): (.+?) ===")
 CLEANUP_START_RE = re.compile(r"=== Plex Snapshot Cleanup - (.+?) ====")
 SNAPSHOT_RE = re.compile(r"Sunday detected - creating weekly snapshot")
-SENT_BYTES_RE = re.compile(r"sent ([\d,]+) bytes\s+received ([\d,]+) bytes")
-TOTAL_SIZE_RE = re.compile(r"total size is ([\d,]+)\s+speedup is")
+
+# All stats-file markers fused into one alternation, so each line of the
+# extract is scanned by the regex engine once instead of five times;
+# dispatch is on match.lastgroup. Branches are ordered by match
+# frequency (rsync emits sent/total once or twice per run, the ===
+# markers once), so the engine usually succeeds on the first or second
+# alternative it tries at a match position.
+MARKER_RE = re.compile(
+    r"sent (?P<sent>[\d,]+) bytes\s+received [\d,]+ bytes|"
+    r"total size is (?P<total>[\d,]+)\s+speedup is|"
+    r"=== Plex Backup Started: (?P<start>.+?) ===|"
+    r"=== Plex Backup Completed Successfully: (?P<succ>.+?) ===|"
+    r"=== Plex Backup FAILED with code \d+: (?P<fail>.+?) ==="
+)
+
+# Bytes twin of MARKER_RE, for scanning mmapped files without decoding
+MARKER_RE_B = re.compile(MARKER_RE.pattern.encode("ascii"))
 
 # Date format from the bash `date` command output
 # e.g. "Mon Feb 23 03:13:23 AM EST 2026"
@@ -41,9 +57,43 @@ DATE_FORMATS = [
 ]
 
 
+# Fast path for the bash `date` forms: one compiled regex and a direct
+# datetime() construction, instead of up to five strptime trials (each
+# of which re-parses its format string).
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+_DATE_RE = re.compile(
+    r"^[A-Za-z]{3}\s+(?P<mon>[A-Za-z]{3})\s+(?P<d>\d{1,2})\s+"
+    r"(?P<h>\d{1,2}):(?P<mi>\d{2}):(?P<s>\d{2})"
+    r"(?:\s+(?P<ampm>[AP]M))?(?:\s+[A-Za-z]{2,5})?\s+(?P<y>\d{4})$"
+)
+
+
+@lru_cache(maxsize=4096)
 def _parse_date(date_str: str) -> Optional[datetime]:
-    """Try multiple date formats to parse a date string."""
+    """Parse the bash `date` output forms, falling back to ISO formats.
+
+    Pure function over a small repeating domain (the same run's start
+    date shows up in multiple markers), so memoized.
+    """
     date_str = date_str.strip()
+    m = _DATE_RE.match(date_str)
+    if m:
+        month = _MONTHS.get(m.group("mon").capitalize())
+        if month:
+            hour = int(m.group("h"))
+            ampm = m.group("ampm")
+            if ampm:
+                hour = hour % 12 + (12 if ampm == "PM" else 0)
+            try:
+                return datetime(
+                    int(m.group("y")), month, int(m.group("d")),
+                    hour, int(m.group("mi")), int(m.group("s")),
+                )
+            except ValueError:
+                return None
     for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(date_str, fmt)
@@ -52,6 +102,7 @@ def _parse_date(date_str: str) -> Optional[datetime]:
     return None
 
 
+@lru_cache(maxsize=4096)
 def _parse_comma_int(s: str) -> int:
     """Parse a comma-separated integer string like '24,265,611'."""
     return int(s.replace(",", ""))
@@ -67,213 +118,336 @@ def import_from_tracking_file(db: DBSession, tracking_path: str) -> int:
     if not path.exists():
         return 0
 
-    count = 0
-    for line in path.read_text().strip().splitlines():
-        line = line.strip()
-        if not line or ":" not in line:
-            continue
+    # Parse first, then dedupe against one SELECT of (started_at, type)
+    # keys instead of two lookup queries per line, and insert everything
+    # with a single Core executemany.
+    parsed: List[Tuple[datetime, str]] = []
+    with path.open("r", buffering=1 << 16) as f:
+        for line in f:
+            line = line.strip()
+            if not line or ":" not in line:
+                continue
+
+            date_str, result = line.rsplit(":", 1)
+            try:
+                backup_date = datetime.strptime(date_str.strip(), "%Y-%m-%d")
+            except ValueError:
+                continue
+
+            # The backup runs at 3 AM
+            started_at = backup_date.replace(hour=3, minute=0, second=0)
+            status = "success" if result.strip() == "success" else "failure"
+            parsed.append((started_at, status))
+
+    if not parsed:
+        return 0
 
-        date_str, result = line.rsplit(":", 1)
-        try:
-            backup_date = datetime.strptime(date_str.strip(), "%Y-%m-%d")
-        except ValueError:
-            continue
+    existing = {
+        (row.started_at, row.backup_type)
+        for row in db.query(BackupRun.started_at, BackupRun.backup_type)
+        .filter(BackupRun.started_at >= min(p[0] for p in parsed))
+        .all()
+    }
+
+    rows: List[Dict] = []
+
+    def _add_row(backup_type: str, status: str, started_at: datetime) -> None:
+        key = (started_at, backup_type)
+        if key in existing:
+            return
+        existing.add(key)
+        rows.append({
+            "backup_type": backup_type,
+            "status": status,
+            "started_at": started_at,
+            "triggered_by": "cron",
+        })
+
+    for started_at, status in parsed:
+        _add_row("daily_mirror", status, started_at)
+
+        # Sunday = snapshot day, plus a cleanup entry at 4 AM
+        if started_at.weekday() == 6 and status == "success":
+            _add_row("snapshot", "success", started_at.replace(hour=3, minute=30))
+            _add_row("cleanup", "success", started_at.replace(hour=4, minute=0))
+
+    if rows:
+        db.execute(BackupRun.__table__.insert(), rows)
+        db.commit()
+    return len(rows)
 
-        # The backup runs at 3 AM
-        started_at = backup_date.replace(hour=3, minute=0, second=0)
-        status = "success" if result.strip() == "success" else "failure"
-
-        # Check for Sunday = snapshot day
-        is_sunday = started_at.weekday() == 6
-        backup_type = "daily_mirror"
-
-        # Skip if already exists
-        existing = (
-            db.query(BackupRun)
-            .filter(
-                BackupRun.started_at == started_at,
-                BackupRun.backup_type == backup_type,
-            )
-            .first()
-        )
-        if existing:
-            continue
 
-        run = BackupRun(
-            backup_type=backup_type,
-            status=status,
-            started_at=started_at,
-            triggered_by="cron",
-        )
-        db.add(run)
-        count += 1
-
-        # If Sunday, also create a snapshot entry
-        if is_sunday and status == "success":
-            snap_existing = (
-                db.query(BackupRun)
-                .filter(
-                    BackupRun.started_at == started_at,
-                    BackupRun.backup_type == "snapshot",
-                )
-                .first()
-            )
-            if not snap_existing:
-                snap = BackupRun(
-                    backup_type="snapshot",
-                    status="success",
-                    started_at=started_at.replace(hour=3, minute=30),
-                    triggered_by="cron",
-                )
-                db.add(snap)
-                count += 1
-
-            # Also a cleanup entry at 4 AM
-            cleanup_existing = (
-                db.query(BackupRun)
-                .filter(
-                    BackupRun.started_at == started_at.replace(hour=4),
-                    BackupRun.backup_type == "cleanup",
-                )
-                .first()
-            )
-            if not cleanup_existing:
-                cleanup = BackupRun(
-                    backup_type="cleanup",
-                    status="success",
-                    started_at=started_at.replace(hour=4, minute=0),
-                    triggered_by="cron",
-                )
-                db.add(cleanup)
-                count += 1
+# Tail-scan tuning: read fixed-size blocks backwards from EOF until
+# they cover enough backup runs to enrich everything the tracking file
+# reports (30 days), or the scan budget is spent.
+_TAIL_BLOCK_BYTES = 16 * 1024 * 1024
+_TAIL_SCAN_CAP = 512 * 1024 * 1024
+_TAIL_MIN_RUNS = 30
+
+
+def _matching_lines(data: bytes, scan_from: int = 0) -> List[bytes]:
+    """Return the full lines of data[scan_from:] that contain a marker.
+
+    Drives finditer over the raw bytes and expands each hit to its line
+    boundaries, instead of decoding and allocating a string per line
+    just to probe most of them for no match. scan_from skips a leading
+    partial line without copying the buffer.
+    """
+    lines = []
+    for m in MARKER_RE_B.finditer(data, scan_from):
+        start = data.rfind(b"\n", scan_from, m.start()) + 1
+        if start == 0:
+            start = scan_from
+        end = data.find(b"\n", m.end())
+        end = len(data) if end == -1 else end + 1
+        lines.append(data[start:end])
+    return lines
+
+
+def _scan_log_tail(log_path: str, size: int) -> List[bytes]:
+    """Scan the tail of the main log for marker lines, reading backwards.
+
+    Reads one fixed-size block at a time from EOF, carrying the partial
+    line at each block boundary into the next (earlier) block, so peak
+    memory stays around one block however sparse the markers are. Stops
+    after _TAIL_MIN_RUNS backup starts or _TAIL_SCAN_CAP bytes, so cost
+    is O(scanned tail), never O(file size).
+    """
+    blocks: List[List[bytes]] = []
+    runs = 0
+    carry = b""
+    pos = size
+    floor = max(0, size - _TAIL_SCAN_CAP)
+    with open(log_path, "rb") as f:
+        while pos > floor and runs < _TAIL_MIN_RUNS:
+            start = max(floor, pos - _TAIL_BLOCK_BYTES)
+            f.seek(start)
+            chunk = f.read(pos - start) + carry
+            pos = start
+            scan_from = 0
+            if start > 0:
+                # The bytes before the first newline continue a line
+                # from the previous (earlier) block; hand them over.
+                nl = chunk.find(b"\n")
+                if nl == -1:
+                    carry = chunk
+                    continue
+                carry = chunk[: nl + 1]
+                scan_from = nl + 1
+            else:
+                carry = b""
+            blocks.append(_matching_lines(chunk, scan_from))
+            runs += sum(1 for line in blocks[-1] if b"Backup Started" in line)
+    # Blocks were collected newest-first; restore file order
+    return [line for block in reversed(blocks) for line in block]
+
+
+def _read_extract_meta(meta_path: Path) -> Optional[Dict]:
+    try:
+        meta = json.loads(meta_path.read_text())
+        return meta if {"size", "mtime", "offset"} <= meta.keys() else None
+    except (OSError, ValueError):
+        return None
 
-    if count:
-        db.commit()
-    return count
+
+def _append_new_markers(log_path: str, extract_path: str, offset: int, size: int) -> int:
+    """Scan only log bytes [offset, size) and append marker lines.
+
+    Returns the new offset (advanced to the last complete line).
+    """
+    with open(log_path, "rb") as f:
+        f.seek(offset)
+        data = f.read(size - offset)
+    # Don't consume a trailing partial line; re-read it next pass
+    last_nl = data.rfind(b"\n")
+    if last_nl == -1:
+        return offset
+    data = data[: last_nl + 1]
+
+    matched = _matching_lines(data)
+    if matched:
+        with open(extract_path, "ab") as out:
+            out.writelines(matched)
+    return offset + last_nl + 1
 
 
 def extract_stats_file(log_path: str) -> Optional[str]:
     """Extract marker/stats lines from the main log into a small cache file.
 
-    Uses grep -F with multiple fixed-string patterns to quickly scan the
-    15GB+ log file. The result is cached in the app's data directory.
+    The 15GB+ log is never read front to back: the first pass (and any
+    pass after rotation) scans backwards from EOF just far enough to
+    cover the runs the tracking file knows about, and a sidecar records
+    (size, mtime, offset) so later polls scan only appended bytes.
     Returns the path to the extract file, or None on failure.
     """
     from app.config import BASE_DIR
     data_dir = BASE_DIR / "data"
     data_dir.mkdir(exist_ok=True)
     extract_path = str(data_dir / "plex-backup-stats.txt")
+    meta_path = data_dir / "plex-backup-stats.meta"
 
-    # Use grep with fixed strings piped through grep -E for speed.
-    # grep -F is much faster than grep -E on large files.
-    # We grep for lines containing any of our marker strings.
     try:
-        result = subprocess.run(
-            ["bash", "-c",
-             f"grep -F -e '=== Plex Backup' -e 'total size is' -e 'sent ' '{log_path}' "
-             f"| grep -E '=== Plex Backup (Started|Completed|FAILED)|sent .* bytes.*received|total size is .* speedup' "
-             f"> '{extract_path}'"],
-            capture_output=True, text=True, timeout=300,
-        )
-        # grep returns 1 if no matches - that's ok
-        if result.returncode not in (0, 1):
+        st = os.stat(log_path)
+    except OSError:
+        return None
+
+    meta = _read_extract_meta(meta_path)
+    if meta is not None and Path(extract_path).exists() and st.st_size >= meta["size"]:
+        if st.st_size == meta["size"] and st.st_mtime == meta["mtime"]:
+            return extract_path
+        # Grown in place: scan only the appended bytes
+        try:
+            offset = _append_new_markers(log_path, extract_path, meta["offset"], st.st_size)
+        except OSError:
             return None
+        meta_path.write_text(
+            json.dumps({"size": st.st_size, "mtime": st.st_mtime, "offset": offset})
+        )
         return extract_path
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+
+    # First run, or the log shrank (rotation): scan the tail window
+    try:
+        matched = _scan_log_tail(log_path, st.st_size)
+        with open(extract_path, "wb") as out:
+            out.writelines(matched)
+    except OSError:
         return None
+    meta_path.write_text(
+        json.dumps({"size": st.st_size, "mtime": st.st_mtime, "offset": st.st_size})
+    )
+    return extract_path
 
 
-def enrich_from_stats(db: DBSession, stats_path: str) -> int:
-    """Read an extracted stats file and enrich backup records.
+def _iter_stats_entries(buf):
+    """Yield one completed run dict per success/failure marker in buf.
 
-    The stats file contains just the marker lines from the main log,
-    produced by extract_stats_file() or the import-logs CLI command.
+    Generator over the mmapped extract: one scan of the combined bytes
+    pattern, holding only the in-progress entry in memory.
     """
-    path = Path(stats_path)
-    if not path.exists():
-        return 0
-
-    text = path.read_text()
-    if not text.strip():
-        return 0
-
-    # Parse all backup entries from the extracted lines
-    entries = []  # type: List[Dict]
     current = {}  # type: Dict
-
-    for line in text.splitlines():
-        m = BACKUP_START_RE.search(line)
-        if m:
-            current = {"start": _parse_date(m.group(1))}
+    for m in MARKER_RE_B.finditer(buf):
+        tag = m.lastgroup
+        if tag == "start":
+            current = {"start": _parse_date(m.group("start").decode())}
+        elif not current:
             continue
-
-        if not current:
-            continue
-
-        m = SENT_BYTES_RE.search(line)
-        if m:
+        elif tag == "sent":
             # Keep the last sent/total pair (Sunday has 2 rsync runs)
-            current["sent"] = _parse_comma_int(m.group(1))
-
-        m = TOTAL_SIZE_RE.search(line)
-        if m:
-            current["total_size"] = _parse_comma_int(m.group(1))
-
-        m = BACKUP_SUCCESS_RE.search(line)
-        if m:
-            current["end"] = _parse_date(m.group(1))
+            current["sent"] = _parse_comma_int(m.group("sent").decode())
+        elif tag == "total":
+            current["total_size"] = _parse_comma_int(m.group("total").decode())
+        elif tag == "succ":
+            current["end"] = _parse_date(m.group("succ").decode())
             current["status"] = "success"
-            entries.append(current)
+            yield current
             current = {}
-
-        m = BACKUP_FAILED_RE.search(line)
-        if m:
-            current["end"] = _parse_date(m.group(2))
+        elif tag == "fail":
+            current["end"] = _parse_date(m.group("fail").decode())
             current["status"] = "failure"
-            entries.append(current)
+            yield current
             current = {}
 
-    # Now enrich database records with the extracted data
-    updated = 0
-    for entry in entries:
-        start = entry.get("start")
-        if not start:
-            continue
 
-        # Find matching daily_mirror record for this date
-        run = (
-            db.query(BackupRun)
-            .filter(
-                BackupRun.backup_type == "daily_mirror",
-                BackupRun.started_at >= start.replace(hour=0, minute=0),
-                BackupRun.started_at <= start.replace(hour=23, minute=59),
-            )
-            .first()
+def enrich_from_stats(db: DBSession, stats_path: str) -> int:
+    """Read an extracted stats file and enrich backup records.
+
+    The stats file contains just the marker lines from the main log,
+    produced by extract_stats_file() or the import-logs CLI command.
+    """
+    path = Path(stats_path)
+
+    # Stream completed entries straight into the per-day match dict, so
+    # peak memory is one entry per covered day rather than the full
+    # entry history plus that dict.
+    by_day = {}
+    try:
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as buf:
+            for entry in _iter_stats_entries(buf):
+                start = entry.get("start")
+                if start:
+                    by_day.setdefault(start.date(), entry)
+    except (OSError, ValueError):
+        # Missing or empty file (mmap rejects zero-length maps)
+        return 0
+
+    if not by_day:
+        return 0
+
+    # Now enrich database records with the extracted data. Instead of one
+    # lookup per entry, stream the candidate daily_mirror rows for the
+    # covered date range once and match them by calendar day; yield_per
+    # keeps peak memory flat however much history the extract covers.
+
+    lo = datetime.combine(min(by_day), datetime.min.time())
+    hi = datetime.combine(max(by_day), datetime.max.time())
+    result = db.execute(
+        select(
+            BackupRun.id,
+            BackupRun.started_at,
+            BackupRun.finished_at,
+            BackupRun.duration_seconds,
+            BackupRun.total_size_bytes,
+            BackupRun.transferred_bytes,
         )
-        if not run:
+        .where(
+            BackupRun.backup_type == "daily_mirror",
+            BackupRun.started_at >= lo,
+            BackupRun.started_at <= hi,
+        )
+        .execution_options(yield_per=200)
+    )
+
+    # Collect all changed rows and write them back with one executemany
+    # UPDATE instead of flushing one statement per ORM object.
+    params = []
+    for row in result:
+        entry = by_day.pop(row.started_at.date(), None)
+        if entry is None:
             continue
 
         changed = False
+        start = entry.get("start")
         total_size = entry.get("total_size")
         sent = entry.get("sent")
         end = entry.get("end")
 
-        if total_size and not run.total_size_bytes:
-            run.total_size_bytes = total_size
+        values = {
+            "b_id": row.id,
+            "p_finished_at": row.finished_at,
+            "p_duration": row.duration_seconds,
+            "p_total_size": row.total_size_bytes,
+            "p_transferred": row.transferred_bytes,
+        }
+        if total_size and not row.total_size_bytes:
+            values["p_total_size"] = total_size
             changed = True
-        if sent and not run.transferred_bytes:
-            run.transferred_bytes = sent
+        if sent and not row.transferred_bytes:
+            values["p_transferred"] = sent
             changed = True
-        if start and end and not run.duration_seconds:
-            run.duration_seconds = (end - start).total_seconds()
-            run.finished_at = end
+        if start and end and not row.duration_seconds:
+            values["p_duration"] = (end - start).total_seconds()
+            values["p_finished_at"] = end
             changed = True
         if changed:
-            updated += 1
-
-    if updated:
+            params.append(values)
+
+    if params:
+        table = BackupRun.__table__
+        db.execute(
+            table.update()
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                finished_at=bindparam("p_finished_at"),
+                duration_seconds=bindparam("p_duration"),
+                total_size_bytes=bindparam("p_total_size"),
+                transferred_bytes=bindparam("p_transferred"),
+            ),
+            params,
+        )
         db.commit()
-    return updated
+    return len(params)
 
 
 def parse_full_log(db: DBSession, log_path: str) -> int:
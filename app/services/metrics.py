@@ -1,37 +1,77 @@
 """Compute dashboard statistics from backup_runs."""
 
+import time
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import func
+import orjson
+
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session as DBSession
 
 from app.models.backup import BackupRun
 
+# Chart JSON cached per `days` window: the aggregates only change when
+# the poller ingests new rows, so idle dashboard refreshes skip both the
+# aggregation queries and re-serialization.
+_chart_cache: dict[int, tuple[float, str, str]] = {}
+_CHART_CACHE_TTL = 30
+
+# Summary stats cached per (days, max rowid): five aggregations collapse
+# to one SELECT MAX(id) while the table is unchanged. The TTL bounds
+# staleness from in-place UPDATEs, which don't move max(id).
+_stats_cache: dict = {}
+_STATS_CACHE_TTL = 30
+
+
+def invalidate_chart_cache() -> None:
+    """Drop cached chart JSON and stats, e.g. after new rows are ingested."""
+    _chart_cache.clear()
+    _stats_cache.clear()
+
+
+def get_chart_json(db: DBSession, days: int = 30) -> tuple[str, str]:
+    """Return (type_counts_json, daily_sizes_json) for the dashboard charts."""
+    entry = _chart_cache.get(days)
+    if entry is not None and time.monotonic() - entry[0] < _CHART_CACHE_TTL:
+        return entry[1], entry[2]
+    type_counts_json = orjson.dumps(get_backup_type_counts(db, days=days)).decode()
+    daily_sizes_json = orjson.dumps(get_daily_sizes(db, days=days)).decode()
+    _chart_cache[days] = (time.monotonic(), type_counts_json, daily_sizes_json)
+    return type_counts_json, daily_sizes_json
+
 
 def get_dashboard_stats(db: DBSession, days: int = 30) -> dict:
-    """Compute summary stats for the dashboard."""
+    """Compute summary stats for the dashboard, cached on the last rowid."""
+    latest_id = db.query(func.max(BackupRun.id)).scalar()
+    key = (days, latest_id)
+    entry = _stats_cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < _STATS_CACHE_TTL:
+        return entry[1]
+
+    stats = _compute_dashboard_stats(db, days)
+    _stats_cache.clear()
+    _stats_cache[key] = (time.monotonic(), stats)
+    return stats
+
+
+def _compute_dashboard_stats(db: DBSession, days: int) -> dict:
     cutoff = datetime.now(timezone.utc) - timedelta(days=days)
 
-    # Total backups in period
-    total_backups = (
-        db.query(func.count(BackupRun.id))
-        .filter(BackupRun.started_at >= cutoff)
-        .scalar()
-    ) or 0
-
-    # Success count
-    success_count = (
-        db.query(func.count(BackupRun.id))
-        .filter(BackupRun.started_at >= cutoff, BackupRun.status == "success")
-        .scalar()
-    ) or 0
-
-    # Failure count
-    failure_count = (
-        db.query(func.count(BackupRun.id))
-        .filter(BackupRun.started_at >= cutoff, BackupRun.status == "failure")
-        .scalar()
-    ) or 0
+    # One pass over the period: counts, per-status tallies and the
+    # success-duration average come from a single grouped aggregation
+    # instead of four separate scans.
+    totals = db.execute(
+        select(
+            func.count(BackupRun.id),
+            func.sum(case((BackupRun.status == "success", 1), else_=0)),
+            func.sum(case((BackupRun.status == "failure", 1), else_=0)),
+            func.avg(case((BackupRun.status == "success", BackupRun.duration_seconds))),
+        ).where(BackupRun.started_at >= cutoff)
+    ).one()
+    total_backups = totals[0] or 0
+    success_count = totals[1] or 0
+    failure_count = totals[2] or 0
+    avg_duration = totals[3]
 
     # Success rate
     success_rate = (success_count / total_backups * 100) if total_backups > 0 else 0
@@ -52,17 +92,6 @@ def get_dashboard_stats(db: DBSession, days: int = 30) -> dict:
         .first()
     )
 
-    # Average duration for successful backups in period
-    avg_duration = (
-        db.query(func.avg(BackupRun.duration_seconds))
-        .filter(
-            BackupRun.started_at >= cutoff,
-            BackupRun.status == "success",
-            BackupRun.duration_seconds.isnot(None),
-        )
-        .scalar()
-    )
-
     return {
         "total_backups": total_backups,
         "success_count": success_count,
@@ -81,7 +110,7 @@ def get_backup_type_counts(db: DBSession, days: int = 30) -> dict:
         db.query(BackupRun.backup_type, func.count(BackupRun.id))
         .filter(BackupRun.started_at >= cutoff)
         .group_by(BackupRun.backup_type)
-        .all()
+        .yield_per(1000)
     )
     return {row[0]: row[1] for row in rows}
 
@@ -101,7 +130,9 @@ def get_daily_sizes(db: DBSession, days: int = 30) -> list[dict]:
         )
         .group_by(func.date(BackupRun.started_at))
         .order_by(func.date(BackupRun.started_at))
-        .all()
+        # Stream instead of materializing: grouped output is one row per
+        # day/type today, but this keeps memory bounded as history grows
+        .yield_per(1000)
     )
     return [{"date": str(row.day), "size": row.size} for row in rows]
 
@@ -0,0 +1,44 @@
+"""Shared Jinja2 template environment.
+
+A single Jinja2Templates instance keeps the template bytecode cache hot
+process-wide instead of each router (and the 404 handler) rebuilding its
+own environment.
+"""
+
+import subprocess
+import time
+
+import orjson
+from fastapi.templating import Jinja2Templates
+
+from app.config import BASE_DIR
+
+
+def _asset_version() -> str:
+    """Version string for static asset cache busting.
+
+    Uses the deployed git revision when available (install.sh deploys a
+    clone); otherwise falls back to process start time so a restart
+    still busts caches.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR, capture_output=True, text=True, timeout=5,
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip()
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        pass
+    return str(int(time.time()))
+
+
+ASSET_VERSION = _asset_version()
+
+templates = Jinja2Templates(directory="app/templates")
+
+# orjson-backed |tojson alternative for templates embedding chart data
+templates.env.filters["tojson_fast"] = lambda value: orjson.dumps(value).decode()
+
+# Versioned static asset URLs so browsers can cache them as immutable
+templates.env.filters["static_url"] = lambda path: f"{path}?v={ASSET_VERSION}"
@@ -14,7 +14,6 @@ Admin commands:
   reset-password Reset a user's password
 """
 
-import click
 import sys
 
 BANNER = r"""
@@ -27,6 +26,21 @@ BANNER = r"""
       "Previously on your Plex server..."
 """
 
+# Fast path for the two most common interactive invocations: no args and
+# --help never load Click (or anything else) — the module docstring is
+# the help text. Subcommands still get Click's full option help.
+if __name__ == "__main__" and (
+    len(sys.argv) == 1 or sys.argv[1] in ("-h", "--help")
+):
+    try:
+        print(BANNER)
+        print(__doc__)
+    except BrokenPipeError:
+        pass
+    raise SystemExit(0)
+
+import click  # noqa: E402
+
 
 @click.group(invoke_without_command=True)
 @click.option("--broadcast", is_flag=True, help='Start a backup ("the live show")')